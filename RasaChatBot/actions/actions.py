@@ -1,32 +1,326 @@
-import requests
-from typing import Any, Text, Dict, List, Union # <-- Add Union here
+import re
+import json
+import uuid
+import asyncio
+import string
+import time
+import datetime
+import hashlib
+import functools
+import sys
+import types
+import operator
+import os
+import logging
+import threading
+import httpx
+from collections import OrderedDict
+from typing import Any, Text, Dict, List, Tuple, Union # <-- Add Union here
 
 from rasa_sdk import Action, Tracker, FormValidationAction
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, UserUtteranceReverted
 
+logger = logging.getLogger(__name__)
+# Level follows the action server's logging config (e.g. `rasa run actions --debug`);
+# ACTIONS_LOG_LEVEL=debug overrides it for this module only
+_LOG_LEVEL = os.environ.get("ACTIONS_LOG_LEVEL", "").strip()
+if _LOG_LEVEL:
+    try:
+        logger.setLevel(int(_LOG_LEVEL) if _LOG_LEVEL.isdigit() else _LOG_LEVEL.upper())
+    except ValueError:
+        logger.warning("Ignoring unknown ACTIONS_LOG_LEVEL %r", _LOG_LEVEL)
+
 # --- Define your backend base URL ---
 BACKEND_URL = "https://envirosense-ai-backend.onrender.com" # e.g., "http://localhost:3000/api"
 
+# --- Shared async HTTP client ---
+# Every backend call is bounded so a hung backend can't hold an action (and the user's turn) forever.
+BACKEND_TIMEOUT = httpx.Timeout(10.0, connect=3.05) # Read/write/pool 10s, connect 3.05s
+# Actions run on the action server's event loop, so backend calls must not block it.
+# One pooled client is reused by every action so keep-alive connections (and their
+# TLS sessions) are shared instead of re-handshaking with the backend on each call.
+_transport = httpx.AsyncHTTPTransport(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    retries=2, # Retries failed connection attempts only
+)
+_client = httpx.AsyncClient(
+    base_url=BACKEND_URL,
+    transport=_transport,
+    timeout=BACKEND_TIMEOUT,
+    headers={"User-Agent": "rasa-actions/1.0"},
+)
+
+# Errors an action should report to the user instead of crashing on: HTTP/transport failures,
+# and ValueError for 200 responses whose body isn't JSON (e.g. Render's wake-up page).
+BACKEND_ERRORS = (httpx.HTTPError, ValueError)
+
+# --- Backend Warm-up ---
+# Render idles the backend after ~5 minutes and the next request pays for a cold start.
+# Ping it once at startup and then periodically from a background thread so user turns don't.
+# This only keeps the backend awake: _client's pool belongs to the action server's event loop,
+# so the thread can't warm it and uses its own small client instead.
+BACKEND_KEEPALIVE_INTERVAL = 240 # Seconds
+BACKEND_WARMUP_TIMEOUT = httpx.Timeout(5.0) # Short; the ping only has to reach Render to wake it
+_KEEPALIVE_THREAD_NAME = "backend-keepalive"
+
+def _keep_backend_warm() -> None:
+    with httpx.Client(base_url=BACKEND_URL, timeout=BACKEND_WARMUP_TIMEOUT, headers={"User-Agent": "rasa-actions/1.0"}) as client:
+        while True:
+            try:
+                client.head("/healthz")
+            except httpx.HTTPError as e:
+                logger.debug("Backend warm-up ping failed: %s", e)
+            time.sleep(BACKEND_KEEPALIVE_INTERVAL)
+
+def _ensure_keepalive() -> None:
+    """Starts the keep-alive thread once per process; module reloads (--auto-reload) find the running one."""
+    if os.environ.get("ACTIONS_BACKEND_KEEPALIVE", "1") == "0":
+        return
+    if any(t.name == _KEEPALIVE_THREAD_NAME and t.is_alive() for t in threading.enumerate()):
+        return
+    threading.Thread(target=_keep_backend_warm, name=_KEEPALIVE_THREAD_NAME, daemon=True).start()
+
+_ensure_keepalive()
+
+# --- JSON Codec ---
+# orjson parses and encodes backend payloads several times faster than the stdlib;
+# fall back to json if it isn't installed in the action server environment.
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+def idempotency_key(tracker: Tracker, path: str) -> str:
+    """Derives a key that is stable for this user turn and endpoint.
+
+    If the same turn is re-run (e.g. Rasa re-sends the action call), its POST carries the
+    same key and the backend can drop the duplicate. Falls back to a random key when the
+    message has no ID.
+    """
+    message_id = tracker.latest_message.get("message_id")
+    if not message_id:
+        return uuid.uuid4().hex
+    return hashlib.sha256(f"{tracker.sender_id}:{message_id}:{path}".encode()).hexdigest()
+
+async def post_backend(path: str, headers: Dict[str, str], tracker: Tracker, **kwargs: Any) -> httpx.Response:
+    """POSTs to the backend with a per-turn idempotency key. POSTs are never retried here."""
+    return await _client.post(path, headers={**headers, "Idempotency-Key": idempotency_key(tracker, path)}, **kwargs)
+
+async def post_json(path: str, payload: Any, headers: Dict[str, str], tracker: Tracker) -> httpx.Response:
+    """POSTs a pre-encoded JSON body to the backend."""
+    return await post_backend(path, {**headers, "Content-Type": "application/json"}, tracker, content=json_dumps(payload))
+
+# --- Retrying GETs ---
+# GETs are idempotent, so transient backend statuses (Render 502s while waking up, rate limits)
+# are retried with exponential backoff instead of failing the user's turn. Connect failures are
+# already retried by the transport, and timeouts are not retried so a hung backend still costs
+# at most one BACKEND_TIMEOUT; no retry is started past GET_RETRY_DEADLINE.
+GET_RETRIES = 3
+GET_RETRY_BACKOFF = 0.25 # Seconds, doubled on each retry
+GET_RETRY_DEADLINE = 12.0 # Seconds since the first attempt
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    delay = GET_RETRY_BACKOFF * (2 ** attempt)
+    retry_after = response.headers.get("Retry-After", "")
+    if response.status_code == 429 and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return delay
+
+async def get_with_retry(path: str, **kwargs: Any) -> httpx.Response:
+    deadline = time.monotonic() + GET_RETRY_DEADLINE
+    for attempt in range(GET_RETRIES + 1):
+        response = await _client.get(path, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == GET_RETRIES:
+            return response
+        delay = _retry_delay(response, attempt)
+        if time.monotonic() + delay > deadline:
+            return response
+        logger.debug("GET %s returned %s, retrying in %.2fs", path, response.status_code, delay)
+        await asyncio.sleep(delay)
+    return response
+
 # --- Authentication Helper ---
+# Shared read-only fallback for missing dicts, so lookups don't allocate a new {} each call
+_EMPTY: Dict[str, Any] = {}
+
 def get_auth_token(tracker: Tracker) -> Union[str, None]:
     """Extracts JWT token from Rasa metadata if available."""
-    metadata = tracker.latest_message.get("metadata")
-    if metadata and "token" in metadata:
-        print("Auth token found in metadata.") # For debugging
-        return metadata["token"]
-    print("No auth token found.") # For debugging
+    metadata = tracker.latest_message.get("metadata") or _EMPTY
+    return metadata.get("token")
+
+def auth_headers(token: str) -> Dict[str, str]:
+    """Builds the bearer header dict for a token. Not cached, so raw tokens aren't kept in memory."""
+    return {"Authorization": "Bearer " + token}
+
+# --- Username -> user ID Cache ---
+# Repeat connection requests to the same username skip the /users/search hop.
+USER_ID_CACHE_SIZE = 1024
+_USER_ID_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+_get_id = operator.itemgetter("id")
+
+# Flipped off the first time the backend turns out not to have POST /connections/request-by-username,
+# so later requests go straight to search + request instead of paying for a 404 each time.
+_REQUEST_BY_USERNAME: Dict[str, bool] = {"supported": True}
+
+def remember_user_id(username: str, user_id: Any) -> None:
+    """Stores a resolved user ID, evicting the least recently used entry when full."""
+    _USER_ID_CACHE[username] = user_id
+    _USER_ID_CACHE.move_to_end(username)
+    if len(_USER_ID_CACHE) > USER_ID_CACHE_SIZE:
+        _USER_ID_CACHE.popitem(last=False)
+
+# --- Response Caches ---
+# The leaderboard is global and changes slowly, so one fetch serves every user for a short window.
+# With several action server workers, move this to a shared store (e.g. Redis SETEX) instead.
+LEADERBOARD_TTL = 45 # Seconds
+_LB_CACHE: Dict[str, Any] = {"at": 0.0, "data": None, "refill": None} # refill: in-flight fetch task shared by all callers
+
+# Daily missions only change once a day, so they are cached per user for the current date.
+# Keys are token hashes so raw tokens never sit in memory dumps.
+MISSION_CACHE_SIZE = 10_000
+_MISSION_CACHE: Dict[str, Any] = {"date": None, "missions": {}}
+
+def token_key(token: str) -> bytes:
+    """Returns a stable, non-reversible cache key for an auth token."""
+    return hashlib.sha256(token.encode()).digest()
+
+def get_cached_mission(token: str) -> Union[Dict[str, Any], None]:
+    """Returns today's cached mission for this token, dropping entries from previous days."""
+    today = datetime.datetime.now(datetime.timezone.utc).date().isoformat() # UTC, like the timestamps we send
+    if _MISSION_CACHE["date"] != today:
+        _MISSION_CACHE["date"] = today
+        _MISSION_CACHE["missions"] = {}
+    return _MISSION_CACHE["missions"].get(token_key(token))
+
+def cache_mission(token: str, mission: Dict[str, Any]) -> None:
+    missions = _MISSION_CACHE["missions"]
+    while len(missions) >= MISSION_CACHE_SIZE:
+        del missions[next(iter(missions))] # Oldest first
+    missions[token_key(token)] = mission
+
+# Profiles (Eco-Points) are cached per user briefly so rapid re-asks skip the backend auth + DB lookup.
+PROFILE_TTL = 15 # Seconds
+PROFILE_CACHE_SIZE = 10_000
+_PROFILE_CACHE: "OrderedDict[bytes, Any]" = OrderedDict() # token key -> (fetched_at, profile), oldest first
+
+def get_cached_profile(token: str) -> Union[Dict[str, Any], None]:
+    """Returns the cached profile for this token if it is still fresh."""
+    entry = _PROFILE_CACHE.get(token_key(token))
+    if entry and time.monotonic() - entry[0] < PROFILE_TTL:
+        return entry[1]
     return None
 
+def cache_profile(token: str, profile: Dict[str, Any]) -> None:
+    now = time.monotonic()
+    key = token_key(token)
+    _PROFILE_CACHE[key] = (now, profile)
+    _PROFILE_CACHE.move_to_end(key)
+    # Entries are kept in fetch order, so expired ones sit at the front: drop from there
+    # until the first fresh entry once within the size cap (amortized O(1) per insert)
+    while len(_PROFILE_CACHE) > PROFILE_CACHE_SIZE or now - next(iter(_PROFILE_CACHE.values()))[0] >= PROFILE_TTL:
+        _PROFILE_CACHE.popitem(last=False)
+
+def invalidate_profile(token: str) -> None:
+    """Forgets the cached profile, e.g. after an action that may award Eco-Points."""
+    _PROFILE_CACHE.pop(token_key(token), None)
+
+# --- Backend Fetch Helpers ---
+# Shared by the single-purpose actions and the daily summary; each one serves from its cache when fresh.
+def expect_json_type(data: Any, expected: type, what: str) -> Any:
+    """Rejects payloads of the wrong shape (e.g. JSON null) before they are cached; actions report the ValueError."""
+    if not isinstance(data, expected):
+        raise ValueError(f"Unexpected {what} payload: {type(data).__name__}")
+    return data
+
+async def fetch_profile(token: str) -> Dict[str, Any]:
+    profile = get_cached_profile(token)
+    if profile is None:
+        logger.debug("Attempting to fetch profile...")
+        response = await get_with_retry("/users/profile", headers=auth_headers(token))
+        response.raise_for_status()
+        profile = expect_json_type(json_loads(response.content), dict, "profile")
+        cache_profile(token, profile)
+    return profile
+
+async def fetch_mission(token: str) -> Dict[str, Any]:
+    mission = get_cached_mission(token)
+    if mission is None:
+        logger.debug("Attempting to fetch daily mission...")
+        response = await get_with_retry("/missions/today", headers=auth_headers(token))
+        response.raise_for_status()
+        mission = expect_json_type(json_loads(response.content), dict, "mission")
+        cache_mission(token, mission)
+    return mission
+
+def _fresh_leaderboard() -> Union[List[Dict[str, Any]], None]:
+    if _LB_CACHE["data"] is not None and time.monotonic() - _LB_CACHE["at"] < LEADERBOARD_TTL:
+        return _LB_CACHE["data"]
+    return None
+
+async def _refill_leaderboard() -> List[Dict[str, Any]]:
+    logger.debug("Attempting to fetch leaderboard...")
+    response = await get_with_retry("/users/leaderboard")
+    response.raise_for_status()
+    leaderboard = expect_json_type(json_loads(response.content), list, "leaderboard")
+    _LB_CACHE["at"] = time.monotonic()
+    _LB_CACHE["data"] = leaderboard
+    return leaderboard
+
+def _refill_done(task: "asyncio.Future[Any]") -> None:
+    _LB_CACHE["refill"] = None
+    if not task.cancelled():
+        task.exception() # Mark as retrieved even if every waiter was cancelled
+
+async def fetch_leaderboard() -> List[Dict[str, Any]]:
+    leaderboard = _fresh_leaderboard()
+    if leaderboard is not None:
+        return leaderboard
+    # Only one fetch runs for an expired cache; concurrent callers await the same task,
+    # so they all get its result (or its error) at once instead of refetching in turn
+    task = _LB_CACHE["refill"]
+    if task is None:
+        task = asyncio.ensure_future(_refill_leaderboard())
+        task.add_done_callback(_refill_done)
+        _LB_CACHE["refill"] = task
+    # Shielded so one caller's cancellation doesn't cancel the fetch for everyone else
+    return await asyncio.shield(task)
+
 # --- Moderation Helper ---
+INAPPROPRIATE_WORDS = frozenset({"badword1", "badword2", "idiot", "stupid"}) # Add more
+# Single alternation matches every blocklist word in one pass over the message
+_INAPPROPRIATE_RE = re.compile("|".join(map(re.escape, sorted(INAPPROPRIATE_WORDS))))
+# Punctuation is dropped before matching so "s.t.u.p.i.d" is still caught
+_STRIP_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
 def contains_inappropriate(text: str) -> bool:
     """Basic check for inappropriate words."""
-    inappropriate_words = ["badword1", "badword2", "idiot", "stupid"] # Add more
-    return any(word in text.lower() for word in inappropriate_words)
+    lowered = text.lower().translate(_STRIP_PUNCTUATION)
+    return _INAPPROPRIATE_RE.search(lowered) is not None
+
+def moderated(run):
+    """Decorates an action's run() so inappropriate messages are warned about and reverted before it runs."""
+    @functools.wraps(run)
+    async def wrapper(self, dispatcher: CollectingDispatcher,
+                      tracker: Tracker,
+                      domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        user_message = tracker.latest_message.get('text')
+        if user_message and contains_inappropriate(user_message):
+            dispatcher.utter_message(response="utter_moderation_warning")
+            return [UserUtteranceReverted()]
+        return await run(self, dispatcher, tracker, domain)
+    return wrapper
 
 # --- Pollutant Knowledge Base ---
 # Used only if action_explain_pollutant is triggered (e.g., by logged-out user)
-POLLUTANT_DB = {
+# Read-only mapping with lowercase, interned keys; build it once at import.
+POLLUTANT_DB = types.MappingProxyType({sys.intern(k): v for k, v in {
     "carbon monoxide": "Carbon Monoxide (CO) is a toxic gas produced by incomplete burning of fuels. In high concentrations, it reduces oxygen in the bloodstream.",
     "co": "Carbon Monoxide (CO) is a toxic gas produced by incomplete burning of fuels. In high concentrations, it reduces oxygen in the bloodstream.",
     "sulphur dioxide": "Sulphur Dioxide (SO₂) is a gas from burning fossil fuels like coal and oil. It harms the respiratory system and contributes to acid rain.",
@@ -37,7 +331,26 @@ POLLUTANT_DB = {
     "no2": "Nitrogen Dioxide (NO₂) comes from burning fuel, mainly from vehicles and power plants. It can irritate the respiratory system.",
     "pm2.5": "PM2.5 are fine inhalable particles that can travel deep into the respiratory tract, reaching the lungs and causing serious health issues.",
     "pm10": "PM10 are coarse inhalable particles from sources like dust and construction. They can irritate the eyes, nose, and throat."
-}
+}.items()})
+_POLLUTANT_KEYS = tuple(POLLUTANT_DB)
+# Whole-word keyword matcher for the NLU-miss fallback; longest keys first so
+# "carbon monoxide" wins over "co" (and "co" no longer fires inside "incomplete")
+_POLLUTANT_RE = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in sorted(_POLLUTANT_KEYS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
+@functools.lru_cache(maxsize=512)
+def explain_pollutants(pollutants: Tuple[str, ...]) -> str:
+    """Builds the explanation message; the same pollutant questions repeat a lot, so results are memoized."""
+    responses = []
+    for p in pollutants:
+        description = POLLUTANT_DB.get(p.lower())
+        if description:
+            responses.append(description)
+        else:
+            responses.append(f"I don't have specific information on '{p}'.")
+    return "\n\n".join(responses)
 
 # --- General Knowledge / Fallback Action ---
 # Placeholder - Requires setting up Google Search API credentials
@@ -50,7 +363,7 @@ class ActionGeneralKnowledgeFallback(Action):
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
         user_message = tracker.latest_message.get('text')
-        print(f"Entering fallback for message: {user_message}") # Debugging
+        logger.debug("Entering fallback for message: %s", user_message)
 
         # Optional: Add simple irrelevance check here if needed
         # if looks_irrelevant(user_message):
@@ -69,23 +382,17 @@ class ActionExplainPollutant(Action):
     def name(self) -> Text:
         return "action_explain_pollutant"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-
-        # --- Basic Moderation Check ---
-        user_message = tracker.latest_message.get('text')
-        if user_message and contains_inappropriate(user_message):
-            dispatcher.utter_message(response="utter_moderation_warning")
-            return [UserUtteranceReverted()]
-
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         pollutants = list(tracker.get_latest_entity_values("pollutant"))
-        print(f"Entities extracted for pollutant explanation: {pollutants}") # Debugging
+        logger.debug("Entities extracted for pollutant explanation: %s", pollutants)
 
         if not pollutants:
             # Maybe the NLU failed, try a basic keyword check as a backup
-            text = user_message.lower()
-            found_keywords = [p for p in POLLUTANT_DB if p in text]
+            user_message = tracker.latest_message.get('text') or ""
+            found_keywords = list(dict.fromkeys(m.lower() for m in _POLLUTANT_RE.findall(user_message)))
             if found_keywords:
                 pollutants = found_keywords
             else:
@@ -93,15 +400,7 @@ class ActionExplainPollutant(Action):
                  return []
 
 
-        responses = []
-        for p in pollutants:
-            description = POLLUTANT_DB.get(p.lower())
-            if description:
-                responses.append(description)
-            else:
-                responses.append(f"I don't have specific information on '{p}'.")
-
-        dispatcher.utter_message(text="\n\n".join(responses))
+        dispatcher.utter_message(text=explain_pollutants(tuple(pollutants)))
         return []
 
 
@@ -111,31 +410,22 @@ class ActionGetEcoPoints(Action):
     def name(self) -> Text:
         return "action_get_eco_points"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        # --- Basic Moderation Check ---
-        user_message = tracker.latest_message.get('text')
-        if user_message and contains_inappropriate(user_message):
-            dispatcher.utter_message(response="utter_moderation_warning")
-            return [UserUtteranceReverted()]
-
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if not token:
             dispatcher.utter_message(response="utter_need_login")
             return []
 
-        headers = {"Authorization": f"Bearer {token}"}
         try:
-            print("Attempting to fetch EcoPoints...") # Debugging
-            response = requests.get(f"{BACKEND_URL}/users/profile", headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            data = await fetch_profile(token)
             points = data.get("ecoPoints", 0) # Adjust key based on your API
             dispatcher.utter_message(text=f"You currently have {points} Eco-Points!")
-            print(f"Successfully fetched EcoPoints: {points}") # Debugging
-        except requests.exceptions.RequestException as e:
-            print(f"API Error fetching eco points: {e}")
+            logger.debug("Successfully fetched EcoPoints: %s", points)
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error fetching eco points: %s", e)
             dispatcher.utter_message(text="Sorry, I couldn't fetch your Eco-Points right now.")
         return []
 
@@ -143,35 +433,32 @@ class ActionGetMyReports(Action):
     def name(self) -> Text:
         return "action_get_my_reports"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        # --- Basic Moderation Check ---
-        user_message = tracker.latest_message.get('text')
-        if user_message and contains_inappropriate(user_message):
-            dispatcher.utter_message(response="utter_moderation_warning")
-            return [UserUtteranceReverted()]
-
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if not token:
             dispatcher.utter_message(response="utter_need_login")
             return []
 
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = auth_headers(token)
         try:
-            print("Attempting to fetch user reports...") # Debugging
-            response = requests.get(f"{BACKEND_URL}/reports/mine", headers=headers)
+            logger.debug("Attempting to fetch user reports...")
+            response = await get_with_retry("/reports/mine", headers=headers)
             response.raise_for_status()
-            reports = response.json()
+            reports = expect_json_type(json_loads(response.content), list, "reports")
             if reports:
-                report_list = "\n".join([f"- Report ID: {r.get('id', 'N/A')}, Location: {r.get('location', {}).get('name', 'N/A')}" for r in reports[:5]]) # Adjust keys
+                recent = [expect_json_type(r, dict, "report") for r in reports[:5]]
+                rows = [f"- Report ID: {r.get('id', 'N/A')}, Location: {(r.get('location') or _EMPTY).get('name', 'N/A')}" for r in recent] # Adjust keys
+                report_list = "\n".join(rows)
                 dispatcher.utter_message(text=f"Here are your recent reports:\n{report_list}")
-                print("Successfully fetched reports.") # Debugging
+                logger.debug("Successfully fetched reports.")
             else:
                 dispatcher.utter_message(text="You haven't submitted any reports recently.")
-                print("No reports found for user.") # Debugging
-        except requests.exceptions.RequestException as e:
-            print(f"API Error fetching reports: {e}")
+                logger.debug("No reports found for user.")
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error fetching reports: %s", e)
             dispatcher.utter_message(text="Sorry, I couldn't fetch your reports right now.")
         return []
 
@@ -179,31 +466,22 @@ class ActionGetDailyMission(Action):
     def name(self) -> Text:
         return "action_get_daily_mission"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        # --- Basic Moderation Check ---
-        user_message = tracker.latest_message.get('text')
-        if user_message and contains_inappropriate(user_message):
-            dispatcher.utter_message(response="utter_moderation_warning")
-            return [UserUtteranceReverted()]
-
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if not token:
             dispatcher.utter_message(response="utter_need_login")
             return []
 
-        headers = {"Authorization": f"Bearer {token}"}
         try:
-            print("Attempting to fetch daily mission...") # Debugging
-            response = requests.get(f"{BACKEND_URL}/missions/today", headers=headers)
-            response.raise_for_status()
-            mission = response.json()
+            mission = await fetch_mission(token)
             mission_desc = mission.get("description", "No mission assigned today.") # Adjust key
             dispatcher.utter_message(text=f"Today's mission: {mission_desc}")
-            print(f"Successfully fetched mission: {mission_desc}") # Debugging
-        except requests.exceptions.RequestException as e:
-            print(f"API Error fetching mission: {e}")
+            logger.debug("Successfully fetched mission: %s", mission_desc)
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error fetching mission: %s", e)
             dispatcher.utter_message(text="Sorry, I couldn't fetch your daily mission right now.")
         return []
 
@@ -211,43 +489,78 @@ class ActionGetLeaderboardTop(Action):
     def name(self) -> Text:
         return "action_get_leaderboard_top"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        # --- Basic Moderation Check ---
-        user_message = tracker.latest_message.get('text')
-        if user_message and contains_inappropriate(user_message):
-            dispatcher.utter_message(response="utter_moderation_warning")
-            return [UserUtteranceReverted()]
-
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         # Leaderboard might be public, adjust if authentication is needed
         # token = get_auth_token(tracker)
-        # headers = {"Authorization": f"Bearer {token}"} if token else {}
+        # headers = auth_headers(token) if token else {}
         try:
-            print("Attempting to fetch leaderboard...") # Debugging
-            response = requests.get(f"{BACKEND_URL}/users/leaderboard")
-            response.raise_for_status()
-            leaderboard = response.json()
+            leaderboard = await fetch_leaderboard()
             if leaderboard:
-                top_users = "\n".join([f"- {i+1}. {u.get('username', 'N/A')} ({u.get('ecoPoints', 0)} points)" for i, u in enumerate(leaderboard[:3])]) # Adjust keys
+                top = leaderboard[:3]
+                rows = [f"- {i}. {u.get('username', 'N/A')} ({u.get('ecoPoints', 0)} points)" for i, u in enumerate(top, 1)] # Adjust keys
+                top_users = "\n".join(rows)
                 dispatcher.utter_message(text=f"Here are the current top contributors:\n{top_users}")
-                print("Successfully fetched leaderboard.") # Debugging
+                logger.debug("Successfully fetched leaderboard.")
             else:
                 dispatcher.utter_message(text="The leaderboard is currently empty.")
-                print("Leaderboard is empty.") # Debugging
-        except requests.exceptions.RequestException as e:
-            print(f"API Error fetching leaderboard: {e}")
+                logger.debug("Leaderboard is empty.")
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error fetching leaderboard: %s", e)
             dispatcher.utter_message(text="Sorry, I couldn't fetch the leaderboard right now.")
         return []
 
+class ActionGetDailySummary(Action):
+    def name(self) -> Text:
+        return "action_get_daily_summary"
+
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        token = get_auth_token(tracker)
+        if not token:
+            dispatcher.utter_message(response="utter_need_login")
+            return []
+
+        # Fetch all three concurrently; a failed call only blanks its own line of the summary
+        profile, mission, leaderboard = await asyncio.gather(
+            fetch_profile(token), fetch_mission(token), fetch_leaderboard(),
+            return_exceptions=True,
+        )
+        lines = []
+        if isinstance(profile, Exception):
+            logger.warning("API Error fetching eco points for summary: %s", profile)
+            lines.append("- Eco-Points: unavailable right now")
+        else:
+            lines.append(f"- Eco-Points: {profile.get('ecoPoints', 0)}") # Adjust key
+        if isinstance(mission, Exception):
+            logger.warning("API Error fetching mission for summary: %s", mission)
+            lines.append("- Today's mission: unavailable right now")
+        else:
+            lines.append(f"- Today's mission: {mission.get('description', 'No mission assigned today.')}") # Adjust key
+        if isinstance(leaderboard, Exception):
+            logger.warning("API Error fetching leaderboard for summary: %s", leaderboard)
+            lines.append("- Top contributor: unavailable right now")
+        elif leaderboard:
+            top = leaderboard[0]
+            lines.append(f"- Top contributor: {top.get('username', 'N/A')} ({top.get('ecoPoints', 0)} points)") # Adjust keys
+        else:
+            lines.append("- Top contributor: the leaderboard is currently empty")
+
+        dispatcher.utter_message(text="Here's your daily summary:\n" + "\n".join(lines))
+        return []
+
 # --- Action for reporting symptom (runs AFTER symptom_form) ---
 class ActionReportSymptom(Action):
     def name(self) -> Text:
         return "action_report_symptom"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if not token:
             dispatcher.utter_message(response="utter_need_login")
@@ -260,17 +573,18 @@ class ActionReportSymptom(Action):
              dispatcher.utter_message(text="I seem to have missed the symptom. Could you please try reporting it again?")
              return []
 
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = auth_headers(token)
         # Adjust API endpoint and payload structure as needed
-        payload = {"symptom": symptom, "timestamp": datetime.datetime.now().isoformat()}
+        payload = {"symptom": symptom, "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")}
         try:
-            print(f"Attempting to POST symptom: {symptom}") # Debugging
-            response = requests.post(f"{BACKEND_URL}/health/report", headers=headers, json=payload)
+            logger.debug("Attempting to POST symptom: %s", symptom)
+            response = await post_json("/health/report", payload, headers, tracker)
             response.raise_for_status()
+            invalidate_profile(token) # Reporting may award Eco-Points
             dispatcher.utter_message(text=f"Got it. I've logged your symptom: '{symptom}'. Thank you for contributing!")
-            print("Successfully POSTed symptom.") # Debugging
-        except requests.exceptions.RequestException as e:
-            print(f"API Error reporting symptom: {e}")
+            logger.debug("Successfully POSTed symptom.")
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error reporting symptom: %s", e)
             dispatcher.utter_message(text=f"Sorry, I couldn't log your symptom '{symptom}' right now. Please try again later.")
         # Reset slot after use
         return [SlotSet("symptom", None)]
@@ -281,9 +595,9 @@ class ActionCreateHealthReport(Action):
     def name(self) -> Text:
         return "action_create_health_report"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if not token:
             dispatcher.utter_message(response="utter_need_login")
@@ -295,19 +609,26 @@ class ActionCreateHealthReport(Action):
              dispatcher.utter_message(text="I seem to have missed the location. Could you please try creating the report again?")
              return []
 
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = auth_headers(token)
         # Adjust API endpoint and payload structure
         payload = {"location": location, "details": "Report created via chatbot"} # Add other details
         try:
-            print(f"Attempting to POST health report for location: {location}") # Debugging
-            response = requests.post(f"{BACKEND_URL}/reports", headers=headers, json=payload)
+            logger.debug("Attempting to POST health report for location: %s", location)
+            response = await post_json("/reports", payload, headers, tracker)
             response.raise_for_status()
-            # Maybe get report ID from response?
-            report_id = response.json().get("id", "N/A")
+            invalidate_profile(token) # Reporting may award Eco-Points
+            # The report exists once the POST succeeded, so an odd body only costs us the ID
+            report_id = "N/A"
+            try:
+                created = json_loads(response.content)
+                if isinstance(created, dict):
+                    report_id = created.get("id", "N/A")
+            except ValueError:
+                logger.debug("Health report created but response body wasn't JSON")
             dispatcher.utter_message(text=f"Okay, I've created a new health report (ID: {report_id}) for {location}. You can add more details on the website.")
-            print("Successfully POSTed health report.") # Debugging
-        except requests.exceptions.RequestException as e:
-            print(f"API Error creating health report: {e}")
+            logger.debug("Successfully POSTed health report.")
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error creating health report: %s", e)
             dispatcher.utter_message(text=f"Sorry, I couldn't create the health report for {location} right now.")
         # Reset slots
         return [SlotSet("report_location", None)]
@@ -318,9 +639,9 @@ class ActionSendConnectionRequest(Action):
     def name(self) -> Text:
         return "action_send_connection_request"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if not token:
             dispatcher.utter_message(response="utter_need_login")
@@ -331,34 +652,59 @@ class ActionSendConnectionRequest(Action):
              dispatcher.utter_message(text="I seem to have missed the username. Who did you want to connect with?")
              return []
 
-        headers = {"Authorization": f"Bearer {token}"}
-        # This likely requires a two-step process: Find user ID, then POST request
+        headers = auth_headers(token)
         try:
-            # Step 1: Find user ID (adjust endpoint and query param)
-            print(f"Searching for user: {recipient_username}") # Debugging
-            search_response = requests.get(f"{BACKEND_URL}/users/search?username={recipient_username}", headers=headers)
-            search_response.raise_for_status()
-            users = search_response.json()
-
-            if not users:
-                dispatcher.utter_message(text=f"Sorry, I couldn't find a user named '{recipient_username}'. Please check the username.")
-                return [SlotSet("connection_recipient", None)]
-
-            recipient_id = users[0].get("id") # Assuming first result is correct and API returns ID
-            if not recipient_id:
-                 dispatcher.utter_message(text="Found the user, but couldn't get their ID.")
-                 return [SlotSet("connection_recipient", None)]
-
-            # Step 2: Send connection request (adjust endpoint)
-            print(f"Attempting to send connection request to ID: {recipient_id}") # Debugging
-            request_response = requests.post(f"{BACKEND_URL}/connections/request/{recipient_id}", headers=headers)
+            request_response = None
+            by_username_404 = False
+            recipient_id = _USER_ID_CACHE.get(recipient_username)
+            if recipient_id is not None:
+                _USER_ID_CACHE.move_to_end(recipient_username)
+            elif _REQUEST_BY_USERNAME["supported"]:
+                # Let the backend resolve the username itself (one round trip instead of two)
+                logger.debug("Attempting to send connection request to username: %s", recipient_username)
+                request_response = await post_json("/connections/request-by-username", {"username": recipient_username}, headers, tracker)
+                if request_response.status_code == 404:
+                    # Ambiguous: either the backend has no such route or it has no such user.
+                    # The search below tells the two apart.
+                    request_response = None
+                    by_username_404 = True
+
+            if recipient_id is None and request_response is None:
+                # Two-step flow: find user ID, then POST request
+                logger.debug("Searching for user: %s", recipient_username)
+                search_response = await get_with_retry("/users/search", params={"username": recipient_username, "limit": 1}, headers=headers)
+                search_response.raise_for_status()
+                users = expect_json_type(json_loads(search_response.content), list, "user search")
+
+                # Search may be fuzzy, so only an exact username match counts as finding the user
+                user = expect_json_type(users[0], dict, "user") if users else _EMPTY
+                if user.get("username") != recipient_username:
+                    dispatcher.utter_message(text=f"Sorry, I couldn't find a user named '{recipient_username}'. Please check the username.")
+                    return [SlotSet("connection_recipient", None)]
+                if by_username_404:
+                    # The user exists, so the 404 meant the route is missing: stop trying it
+                    logger.debug("Backend has no /connections/request-by-username, using search + request")
+                    _REQUEST_BY_USERNAME["supported"] = False
+
+                try:
+                    recipient_id = _get_id(user) # API returns ID
+                except KeyError:
+                    recipient_id = None
+                if not recipient_id:
+                     dispatcher.utter_message(text="Found the user, but couldn't get their ID.")
+                     return [SlotSet("connection_recipient", None)]
+                remember_user_id(recipient_username, recipient_id)
+
+            if request_response is None:
+                logger.debug("Attempting to send connection request to ID: %s", recipient_id)
+                request_response = await post_backend(f"/connections/request/{recipient_id}", headers, tracker)
             request_response.raise_for_status()
 
             dispatcher.utter_message(text=f"Okay, I've sent a connection request to {recipient_username}.")
-            print("Successfully sent connection request.") # Debugging
+            logger.debug("Successfully sent connection request.")
 
-        except requests.exceptions.RequestException as e:
-            print(f"API Error sending connection request: {e}")
+        except BACKEND_ERRORS as e:
+            logger.warning("API Error sending connection request: %s", e)
             # Check for specific errors e.g., 404 Not Found vs 500 Server Error
             dispatcher.utter_message(text=f"Sorry, I couldn't send the connection request to {recipient_username} right now.")
 
@@ -370,15 +716,10 @@ class ActionHealthEffects(Action):
     def name(self) -> Text:
         return "action_health_effects"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        # --- Basic Moderation Check ---
-        user_message = tracker.latest_message.get('text')
-        if user_message and contains_inappropriate(user_message):
-            dispatcher.utter_message(response="utter_moderation_warning")
-            return [UserUtteranceReverted()]
-
+    @moderated
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         token = get_auth_token(tracker)
         if token:
             # Potentially personalized response for logged-in user in future